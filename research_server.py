@@ -1,24 +1,105 @@
-import arxiv
+import gzip
+import io
 import json
+import logging
+import mmap
 import os
-from typing import List
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, List, Optional
 from mcp.server.fastmcp import FastMCP
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from dotenv import load_dotenv
 import time
 import re
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder if orjson is unavailable
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Get Anthropic API key from environment
 API_KEY = os.getenv("ANTHROPIC_API_KEY", "test_key")  # Default to test key for development
 
 PAPER_DIR = "papers"
 FDA_DIR = "fda_data"
 
+# Persisted paper ID -> topic directory index, stored like the topic files
+PAPER_INDEX_FILE = os.path.join(PAPER_DIR, "_index.json")
+
+# Seconds an identical arXiv search is answered from disk (0 disables)
+try:
+    ARXIV_CACHE_TTL = int(os.getenv("ARXIV_CACHE_TTL", "3600"))
+except ValueError:
+    logger.warning("Ignoring invalid ARXIV_CACHE_TTL=%r, using 3600",
+                   os.getenv("ARXIV_CACHE_TTL"))
+    ARXIV_CACHE_TTL = 3600
+
+# Store FDA snapshots gzip-compressed (fda_info.json.gz) when enabled
+FDA_COMPRESS = os.getenv("FDA_COMPRESS", "false").lower() == "true"
+
+# JSON files larger than this are memory-mapped instead of read into a buffer
+MMAP_THRESHOLD = 1024 * 1024
+
+# A store's append log is folded into its snapshot once it grows past both
+# this size and the size of the snapshot itself
+COMPACT_MIN_LOG_BYTES = 1024 * 1024
+
+# Set once save_fda_data has created FDA_DIR
+_fda_dir_ready = False
+
+# save_fda_data's (topic directory, fda_info.json path) keyed by topic
+_FDA_TOPIC_PATHS: dict[str, tuple[str, str]] = {}
+
+# FDA stores already checked by _migrate_fda_dates in this process
+_ISO_DATE_STORES: set[str] = set()
+
+# get_fda_folders' markdown and the FDA_DIR mtime it was built at
+_FDA_FOLDERS_CACHE: dict = {"mtime": None, "content": ""}
+
+# Most entries _JSON_CACHE and _STORE_CACHE each keep before evicting the
+# least recently used one
+JSON_CACHE_SIZE = 128
+
+# Parsed JSON files keyed by path, stored alongside the mtime they were read at
+_JSON_CACHE: dict[str, tuple[int, dict]] = {}
+
+# Snapshot + append log contents keyed by snapshot path (see _load_store)
+_STORE_CACHE: dict[str, tuple[tuple, dict]] = {}
+
+# Maps paper IDs to the papers_info.json file that holds them
+_PAPER_INDEX: dict[str, str] = {}
+_PAPER_INDEX_MTIME = None
+
+# Shared arXiv client so its HTTP session and rate limiting persist across calls.
+# Created on first use to keep the arxiv import out of server start-up.
+_ARXIV_CLIENT = None
+# Serializes use of the client, whose page size is set per search
+_ARXIV_LOCK = threading.Lock()
+
+# Shared openFDA session: keeps connections alive and retries transient errors
+_FDA_SESSION = requests.Session()
+_FDA_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'Accept': 'application/json',
+    'Accept-Language': 'en-US,en;q=0.5'
+})
+_FDA_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
 # Initialize FastMCP server with SSE transport and capabilities
 mcp = FastMCP(
     "research",
@@ -43,6 +124,323 @@ mcp = FastMCP(
     }
 )
 
+def _json_loads(data):
+    """Parse JSON from bytes, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj, indent: bool = True) -> bytes:
+    """Serialize an object to JSON bytes, indented unless indent is False."""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS stringifies int keys the same way the stdlib does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def _dump_json(fileobj, obj) -> None:
+    """Write obj as indented JSON to a binary file object."""
+    if orjson is not None:
+        # orjson produces bytes directly, with no intermediate str
+        fileobj.write(_json_dumps(obj))
+        return
+    # iterencode yields small chunks, so the whole document is never
+    # held in memory as one string
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+    writer = io.TextIOWrapper(fileobj, encoding="utf-8")
+    try:
+        for chunk in encoder.iterencode(obj):
+            writer.write(chunk)
+        writer.flush()
+    finally:
+        writer.detach()
+
+# Guards cache updates made from _scan_paper_index's worker threads
+_CACHE_LOCK = threading.Lock()
+
+def _cache_put(cache: dict, key, value) -> None:
+    """
+    Store a value in one of the JSON caches, keeping it in LRU order.
+    
+    Dicts keep insertion order, so re-inserting marks the key as most
+    recently used and the first key is always the eviction candidate.
+    """
+    with _CACHE_LOCK:
+        cache.pop(key, None)
+        cache[key] = value
+        while len(cache) > JSON_CACHE_SIZE:
+            del cache[next(iter(cache))]
+
+def _load_json_cached(path: str) -> dict:
+    """
+    Load a JSON file, reusing the parsed result while the file is unchanged.
+
+    The cache entry is keyed by the file's mtime, so a write to the file
+    invalidates it automatically on the next read.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    hit = _JSON_CACHE.get(path)
+    if hit and hit[0] == mtime:
+        _cache_put(_JSON_CACHE, path, hit)
+        return hit[1]
+    with open(path, "rb") as f:
+        if path.endswith(".gz"):
+            data = _json_loads(gzip.decompress(f.read()))
+        elif orjson is not None and os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+            # Parse straight from the page cache without copying the file
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    data = orjson.loads(view)
+        else:
+            data = _json_loads(f.read())
+    _cache_put(_JSON_CACHE, path, (mtime, data))
+    return data
+
+def _log_path(file_path: str) -> str:
+    """Return the path of the .jsonl append log that belongs to a JSON store."""
+    return os.path.splitext(file_path)[0] + ".jsonl"
+
+def _file_signature(path: str):
+    """Return (mtime, size) for a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _snapshot_path(file_path: str) -> str:
+    """Return the snapshot on disk for a store, preferring a gzip-compressed copy."""
+    compressed = file_path + ".gz"
+    return compressed if os.path.exists(compressed) else file_path
+
+def _store_exists(file_path: str) -> bool:
+    """Check whether a store has a snapshot (plain or compressed) or a log."""
+    return (os.path.exists(file_path)
+            or os.path.exists(file_path + ".gz")
+            or os.path.exists(_log_path(file_path)))
+
+def _store_signature(file_path: str) -> tuple:
+    """Return a value that changes whenever a store's snapshot or log changes."""
+    snapshot = _snapshot_path(file_path)
+    return (snapshot, _file_signature(snapshot), _file_signature(_log_path(file_path)))
+
+# FDA document fields with a narrow vocabulary (types, dates, statuses,
+# places), interned on load so repeated values share one str object
+_FDA_INTERN_FIELDS = ('type', 'date', 'retrieved_date')
+_FDA_INTERN_NESTED_FIELDS = {
+    'product_info': ('company_name', 'recall_classification', 'recall_status', 'state', 'city'),
+    'drug_info': ('manufacturer', 'dosage_form', 'route'),
+    'clinical_info': ('study_phase', 'status', 'sponsor')
+}
+
+def _intern_fields(record: dict, fields: tuple) -> None:
+    """Replace the given string fields of record with their interned copies."""
+    for field in fields:
+        value = record.get(field)
+        if type(value) is str:
+            record[field] = sys.intern(value)
+
+def _intern_fda_records(records: dict) -> None:
+    """Intern the narrow-vocabulary fields of records loaded into an FDA store."""
+    for doc in records.values():
+        if not isinstance(doc, dict):
+            continue
+        _intern_fields(doc, _FDA_INTERN_FIELDS)
+        for section, fields in _FDA_INTERN_NESTED_FIELDS.items():
+            nested = doc.get(section)
+            if isinstance(nested, dict):
+                _intern_fields(nested, fields)
+
+def _load_store(file_path: str,
+                intern_records: Optional[Callable[[dict], None]] = None) -> dict:
+    """
+    Load a JSON store: the snapshot dict in file_path updated with every
+    record appended to its .jsonl log.
+    
+    The merged dict is cached until either file changes on disk. A log
+    line that does not parse (typically the torn tail of an append that
+    crashed) is logged and skipped, so the rest of the store stays usable.
+    If given, intern_records is called on the merged dict before it is
+    cached.
+    """
+    log_path = _log_path(file_path)
+    signature = _store_signature(file_path)
+    hit = _STORE_CACHE.get(file_path)
+    if hit and hit[0] == signature:
+        _cache_put(_STORE_CACHE, file_path, hit)
+        return hit[1]
+    snapshot, snapshot_signature, log_signature = signature
+    if snapshot_signature is None and log_signature is None:
+        raise FileNotFoundError(file_path)
+    
+    data = dict(_load_json_cached(snapshot)) if snapshot_signature else {}
+    if log_signature:
+        with open(log_path, "rb") as log_file:
+            for line_number, line in enumerate(log_file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    data.update(_json_loads(line))
+                except json.JSONDecodeError as e:
+                    logger.warning("Skipping unreadable line %d of %s: %s", line_number, log_path, e)
+    if intern_records:
+        intern_records(data)
+    _cache_put(_STORE_CACHE, file_path, (signature, data))
+    return data
+
+def _append_store(file_path: str, records: dict, durable: bool = False,
+                  intern_records: Optional[Callable[[dict], None]] = None) -> None:
+    """
+    Append records to a store's .jsonl log as one {id: record} object per line.
+    
+    If the store is cached and up to date, the cached dict is updated in
+    place (after intern_records, if given, is called on the new records),
+    so the next read does not have to parse the log again. With durable,
+    the log and its directory are fsynced before returning.
+    """
+    signature = _store_signature(file_path)
+    payload = b"".join(
+        _json_dumps({key: value}, indent=False) + b"\n"
+        for key, value in records.items()
+    )
+    with open(_log_path(file_path), "ab+") as log_file:
+        # Start on a fresh line if a crashed append left a torn one, so the
+        # new records are not glued onto it
+        if os.fstat(log_file.fileno()).st_size:
+            log_file.seek(-1, os.SEEK_END)
+            if log_file.read(1) != b"\n":
+                payload = b"\n" + payload
+        log_file.write(payload)
+        if durable:
+            log_file.flush()
+            os.fsync(log_file.fileno())
+    if durable:
+        _fsync_dir(file_path)
+    
+    hit = _STORE_CACHE.get(file_path)
+    if not hit or hit[0] != signature:
+        return
+    new_signature = _store_signature(file_path)
+    old_log_size = signature[2][1] if signature[2] else 0
+    # Only trust the cache if nobody else appended in the meantime
+    if new_signature[:2] == signature[:2] and new_signature[2][1] == old_log_size + len(payload):
+        if intern_records:
+            intern_records(records)
+        hit[1].update(records)
+        _cache_put(_STORE_CACHE, file_path, (new_signature, hit[1]))
+
+def _add_store_records(file_path: str, records: dict, compress: bool = False,
+                       durable: bool = False,
+                       intern_records: Optional[Callable[[dict], None]] = None) -> None:
+    """
+    Add records to a JSON store.
+    
+    Records are appended to the store's log when the store exists;
+    otherwise it is started with a fresh snapshot, gzip-compressed if
+    compress is set. durable and intern_records are passed on to the
+    write and load. A snapshot that fails to parse raises instead of
+    being replaced, so existing data is never discarded.
+    """
+    try:
+        _load_store(file_path, intern_records)
+    except FileNotFoundError:
+        _write_json_atomic(file_path, records, compress=compress, durable=durable)
+        try:
+            os.remove(_log_path(file_path))
+        except FileNotFoundError:
+            pass
+        return
+    if records:
+        _append_store(file_path, records, durable=durable, intern_records=intern_records)
+        _, snapshot_signature, log_signature = _store_signature(file_path)
+        snapshot_size = snapshot_signature[1] if snapshot_signature else 0
+        if log_signature[1] > max(COMPACT_MIN_LOG_BYTES, snapshot_size):
+            _compact_store(file_path, compress=compress, durable=durable)
+
+def _compact_store(file_path: str, compress: bool = False, durable: bool = False) -> None:
+    """Fold a store's append log back into its snapshot."""
+    _replace_store(file_path, _load_store(file_path), compress=compress, durable=durable)
+
+def _replace_store(file_path: str, data: dict, compress: bool = False,
+                   durable: bool = False) -> None:
+    """
+    Replace a store's contents with data as a single snapshot.
+    
+    The snapshot is written atomically before the log is removed, so a
+    crash in between only leaves records that are in both files.
+    """
+    _write_json_atomic(file_path, data, compress=compress, durable=durable)
+    try:
+        os.remove(_log_path(file_path))
+    except FileNotFoundError:
+        pass
+
+def _write_json_atomic(file_path: str, obj, compress: bool = False,
+                       durable: bool = False) -> None:
+    """
+    Write obj as JSON to file_path without ever exposing a partial file.
+    
+    The data goes to a temporary file that is renamed over file_path, so a
+    crash mid-write leaves the previous contents intact. The rename alone
+    does not survive power loss; with durable, the temporary file is
+    fsynced before the rename and the directory after it.
+    With compress, the file is written gzip-compressed to file_path + ".gz".
+    Either way the other variant is removed so only one snapshot remains.
+    """
+    if compress:
+        target, stale = file_path + ".gz", file_path
+    else:
+        target, stale = file_path, file_path + ".gz"
+    
+    temp_file = target + '.tmp'
+    try:
+        with open(temp_file, "wb", buffering=1024 * 1024) as json_file:
+            if compress:
+                # Level 1 already gets most of the ratio on repetitive JSON
+                with gzip.GzipFile(filename="", mode="wb", compresslevel=1,
+                                   fileobj=json_file) as gzip_file:
+                    _dump_json(gzip_file, obj)
+            else:
+                _dump_json(json_file, obj)
+            if durable:
+                json_file.flush()
+                os.fsync(json_file.fileno())
+        os.replace(temp_file, target)
+        if durable:
+            _fsync_dir(target)
+    except Exception:
+        try:
+            os.remove(temp_file)
+        except FileNotFoundError:
+            pass
+        raise
+    try:
+        os.remove(stale)
+    except FileNotFoundError:
+        pass
+    _JSON_CACHE.pop(target, None)
+    _JSON_CACHE.pop(stale, None)
+
+def _fsync_dir(file_path: str) -> None:
+    """Flush the directory entry changes for file_path to disk (POSIX only)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    dir_fd = os.open(os.path.dirname(file_path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+def _get_arxiv_client():
+    """Return the shared arXiv client, creating it on first use."""
+    global _ARXIV_CLIENT
+    if _ARXIV_CLIENT is None:
+        import arxiv
+        _ARXIV_CLIENT = arxiv.Client(page_size=100, delay_seconds=3, num_retries=3)
+    return _ARXIV_CLIENT
+
 @mcp.tool()
 def root() -> dict:
     """
@@ -65,10 +463,32 @@ def search_papers(topic: str, max_results: int = 5) -> List[str]:
     Returns:
         List of paper IDs found in the search
     """
+    path = os.path.join(PAPER_DIR, topic.lower().replace(" ", "_"))
+    file_path = os.path.join(path, "papers_info.json")
+    searches_path = os.path.join(path, "searches.json")
+    search_key = f"{max_results}:{topic}"
+    
+    # Answer a recent identical search from disk instead of calling arXiv
+    cached_ids = _cached_search(searches_path, search_key, file_path)
+    if cached_ids is not None:
+        logger.info("Results are saved in: %s", file_path)
+        return cached_ids
+    
+    # Load existing papers info before calling arXiv. An unreadable store
+    # is never overwritten, so fail now rather than after the search
+    try:
+        papers_info = _load_store(file_path)
+    except FileNotFoundError:
+        papers_info = {}
+    except json.JSONDecodeError as e:
+        logger.error("Error reading %s: %s", file_path, e)
+        raise ValueError(
+            f"The papers data for '{topic}' ({file_path}) is corrupted; "
+            "repair or remove it before searching this topic again."
+        ) from e
+    
+    import arxiv
     
-    # Use arxiv to find the papers 
-    client = arxiv.Client()
-
     # Search for the most relevant articles matching the queried topic
     search = arxiv.Search(
         query = topic,
@@ -76,42 +496,164 @@ def search_papers(topic: str, max_results: int = 5) -> List[str]:
         sort_by = arxiv.SortCriterion.Relevance
     )
 
-    papers = client.results(search)
+    # arxiv requests page_size entries per page regardless of max_results,
+    # so size the page to the search instead of fetching 100 entries
+    client = _get_arxiv_client()
+    with _ARXIV_LOCK:
+        client.page_size = max(1, min(max_results, 100))
+        papers = list(client.results(search))
     
     # Create directory for this topic
-    path = os.path.join(PAPER_DIR, topic.lower().replace(" ", "_"))
     os.makedirs(path, exist_ok=True)
-    
-    file_path = os.path.join(path, "papers_info.json")
 
-    # Try to load existing papers info
-    try:
-        with open(file_path, "r") as json_file:
-            papers_info = json.load(json_file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        papers_info = {}
-
-    # Process each paper and add to papers_info  
+    # Process each paper, building records only for IDs not stored yet.
+    # Short IDs carry the arXiv version, so a stored ID's metadata is final
     paper_ids = []
+    new_papers = {}
     for paper in papers:
-        paper_ids.append(paper.get_short_id())
-        paper_info = {
+        paper_id = paper.get_short_id()
+        paper_ids.append(paper_id)
+        if paper_id in papers_info or paper_id in new_papers:
+            continue
+        new_papers[paper_id] = {
             'title': paper.title,
             'authors': [author.name for author in paper.authors],
             'summary': paper.summary,
+            # Pre-cut for get_topic_papers so rendering never slices the summary
+            'summary_short': paper.summary[:500],
             'pdf_url': paper.pdf_url,
             'published': str(paper.published.date())
         }
-        papers_info[paper.get_short_id()] = paper_info
     
-    # Save updated papers_info to json file
-    with open(file_path, "w") as json_file:
-        json.dump(papers_info, json_file, indent=2)
+    # Append only the new records instead of rewriting the whole file
+    _add_store_records(file_path, new_papers)
+    for paper_id in paper_ids:
+        _PAPER_INDEX.setdefault(paper_id, file_path)
+    _index_papers({paper_id: os.path.basename(path) for paper_id in paper_ids})
+    _record_search(searches_path, search_key, paper_ids)
     
-    print(f"Results are saved in: {file_path}")
+    logger.info("Results are saved in: %s", file_path)
     
     return paper_ids
 
+def _cached_search(searches_path: str, search_key: str, file_path: str):
+    """
+    Return the paper IDs of an identical search made within ARXIV_CACHE_TTL.
+    
+    Returns None when there is no such search or when any of its papers
+    is no longer in the topic's papers_info store.
+    """
+    if ARXIV_CACHE_TTL <= 0:
+        return None
+    try:
+        entry = _load_store(searches_path).get(search_key)
+        papers_info = _load_store(file_path)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if entry is None or time.time() - entry['searched_at'] > ARXIV_CACHE_TTL:
+        return None
+    if not all(paper_id in papers_info for paper_id in entry['paper_ids']):
+        return None
+    return entry['paper_ids']
+
+def _record_search(searches_path: str, search_key: str, paper_ids: List[str]) -> None:
+    """
+    Record a search's paper IDs for _cached_search.
+    
+    Nothing is written while the cache is disabled. searches.json is a
+    disposable cache, so one that does not parse is replaced, and write
+    errors are logged instead of failing the search.
+    """
+    if ARXIV_CACHE_TTL <= 0:
+        return
+    entry = {search_key: {'searched_at': time.time(), 'paper_ids': paper_ids}}
+    try:
+        try:
+            _add_store_records(searches_path, entry)
+        except json.JSONDecodeError as e:
+            logger.warning("Replacing unreadable search cache %s: %s", searches_path, e)
+            _replace_store(searches_path, entry)
+    except (OSError, ValueError) as e:
+        logger.warning("Could not update search cache %s: %s", searches_path, e)
+
+def _load_topic_papers(file_path: str):
+    """Load one topic's papers, returning None if the file cannot be read."""
+    try:
+        return _load_store(file_path)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        logger.error("Error reading %s: %s", file_path, e)
+        return None
+
+def _load_paper_index() -> dict:
+    """Load the persisted paper index, or an empty one if it is missing or unreadable."""
+    try:
+        return _load_store(PAPER_INDEX_FILE)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable paper index %s: %s", PAPER_INDEX_FILE, e)
+        return {}
+
+def _index_papers(topic_dirs: dict, complete: bool = False) -> None:
+    """
+    Record paper ID -> topic directory pairs in the persisted index.
+    
+    IDs that are already indexed keep their topic, matching the first-wins
+    rule of the in-memory index. The index is derived from the topic files,
+    so one that does not parse is replaced from a scan (topic_dirs itself
+    when complete is set) instead of appended to. Write errors are logged,
+    never raised: a stale index only costs a rescan.
+    """
+    try:
+        try:
+            index = _load_store(PAPER_INDEX_FILE)
+        except FileNotFoundError:
+            index = {}
+        except json.JSONDecodeError as e:
+            logger.warning("Rebuilding unreadable paper index %s: %s", PAPER_INDEX_FILE, e)
+            _replace_store(PAPER_INDEX_FILE, topic_dirs if complete else _scan_paper_index())
+            return
+        missing = {paper_id: topic_dir for paper_id, topic_dir in topic_dirs.items()
+                   if paper_id not in index}
+        if missing:
+            _add_store_records(PAPER_INDEX_FILE, missing)
+    except (OSError, ValueError) as e:
+        logger.warning("Could not update paper index %s: %s", PAPER_INDEX_FILE, e)
+
+def _scan_paper_index() -> dict:
+    """
+    Rebuild the in-memory paper ID index by scanning every topic directory
+    once. Returns the index as paper ID -> topic directory pairs.
+    """
+    global _PAPER_INDEX_MTIME
+    _PAPER_INDEX.clear()
+    _PAPER_INDEX_MTIME = os.stat(PAPER_DIR).st_mtime_ns
+    file_paths = []
+    with os.scandir(PAPER_DIR) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                file_path = os.path.join(entry.path, "papers_info.json")
+                if _store_exists(file_path):
+                    file_paths.append(file_path)
+    
+    # Topic files are independent, so overlap their reads and parses
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for file_path, papers_info in zip(file_paths, executor.map(_load_topic_papers, file_paths)):
+            if papers_info is None:
+                continue
+            for known_id in papers_info:
+                _PAPER_INDEX.setdefault(known_id, file_path)
+    
+    return {
+        known_id: os.path.basename(os.path.dirname(file_path))
+        for known_id, file_path in _PAPER_INDEX.items()
+    }
+
+def _build_paper_index() -> None:
+    """Rebuild the paper ID index from a scan."""
+    # Persist what the scan found, so later lookups can skip it
+    _index_papers(_scan_paper_index(), complete=True)
+
 @mcp.tool()
 def extract_info(paper_id: str) -> str:
     """
@@ -123,20 +665,27 @@ def extract_info(paper_id: str) -> str:
     Returns:
         JSON string with paper information if found, error message if not found
     """
- 
-    for item in os.listdir(PAPER_DIR):
-        item_path = os.path.join(PAPER_DIR, item)
-        if os.path.isdir(item_path):
-            file_path = os.path.join(item_path, "papers_info.json")
-            if os.path.isfile(file_path):
-                try:
-                    with open(file_path, "r") as json_file:
-                        papers_info = json.load(json_file)
-                        if paper_id in papers_info:
-                            return json.dumps(papers_info[paper_id], indent=2)
-                except (FileNotFoundError, json.JSONDecodeError) as e:
-                    print(f"Error reading {file_path}: {str(e)}")
-                    continue
+    
+    # The persisted index names the one topic file to open
+    papers_info = None
+    topic_dir = _load_paper_index().get(paper_id)
+    if topic_dir:
+        papers_info = _load_topic_papers(os.path.join(PAPER_DIR, topic_dir, "papers_info.json"))
+    
+    # Fall back to scanning for papers saved before the index existed.
+    # Rescan only when a topic directory was added/removed or the ID is unknown
+    if papers_info is None or paper_id not in papers_info:
+        if (_PAPER_INDEX_MTIME != os.stat(PAPER_DIR).st_mtime_ns
+                or paper_id not in _PAPER_INDEX):
+            _build_paper_index()
+        file_path = _PAPER_INDEX.get(paper_id)
+        papers_info = _load_topic_papers(file_path) if file_path else None
+    
+    if papers_info is not None and paper_id in papers_info:
+        # summary_short only exists for rendering and would repeat the summary
+        paper = {key: value for key, value in papers_info[paper_id].items()
+                 if key != 'summary_short'}
+        return _json_dumps(paper, indent=False).decode("utf-8")
     
     return f"There's no saved information related to paper {paper_id}."
 
@@ -149,25 +698,28 @@ def get_available_folders() -> str:
     """
     folders = []
     
-    # Get all topic directories
-    if os.path.exists(PAPER_DIR):
-        for topic_dir in os.listdir(PAPER_DIR):
-            topic_path = os.path.join(PAPER_DIR, topic_dir)
-            if os.path.isdir(topic_path):
-                papers_file = os.path.join(topic_path, "papers_info.json")
-                if os.path.exists(papers_file):
-                    folders.append(topic_dir)
+    # Get all topic directories; a missing PAPER_DIR just means no topics.
+    # DirEntry.is_dir() reuses the type from the directory listing, so only
+    # the papers_info.json check needs a stat call
+    try:
+        with os.scandir(PAPER_DIR) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    papers_file = os.path.join(entry.path, "papers_info.json")
+                    if _store_exists(papers_file):
+                        folders.append(entry.name)
+    except FileNotFoundError:
+        pass
     
     # Create a simple markdown list
-    content = "# Available Topics\n\n"
+    parts = ["# Available Topics\n\n"]
     if folders:
-        for folder in folders:
-            content += f"- {folder}\n"
-        content += f"\nUse @{folder} to access papers in that topic.\n"
+        parts.extend(f"- {folder}\n" for folder in folders)
+        parts.append("\nUse @<topic> to access papers in that topic.\n")
     else:
-        content += "No topics found.\n"
+        parts.append("No topics found.\n")
     
-    return content
+    return "".join(parts)
 
 @mcp.resource("papers://{topic}")
 def get_topic_papers(topic: str) -> str:
@@ -180,27 +732,51 @@ def get_topic_papers(topic: str) -> str:
     topic_dir = topic.lower().replace(" ", "_")
     papers_file = os.path.join(PAPER_DIR, topic_dir, "papers_info.json")
     
-    if not os.path.exists(papers_file):
+    if not _store_exists(papers_file):
         return f"# No papers found for topic: {topic}\n\nTry searching for papers on this topic first."
     
+    return _render_topic_papers(topic, papers_file, _store_signature(papers_file))
+
+# Markdown for one paper in get_topic_papers
+_PAPER_MARKDOWN = (
+    "## {title}\n"
+    "- **Paper ID**: {paper_id}\n"
+    "- **Authors**: {authors}\n"
+    "- **Published**: {published}\n"
+    "- **PDF URL**: [{pdf_url}]({pdf_url})\n\n"
+    "### Summary\n{summary}...\n\n"
+    "---\n\n"
+)
+
+@lru_cache(maxsize=128)
+def _render_topic_papers(topic: str, papers_file: str, signature: tuple) -> str:
+    """
+    Render the markdown for get_topic_papers.
+    
+    The store signature is part of the cache key, so a cached page is
+    reused only until the topic's papers change on disk.
+    """
     try:
-        with open(papers_file, 'r') as f:
-            papers_data = json.load(f)
+        papers_data = _load_store(papers_file)
         
         # Create markdown content with paper details
-        content = f"# Papers on {topic.replace('_', ' ').title()}\n\n"
-        content += f"Total papers: {len(papers_data)}\n\n"
+        parts = [
+            f"# Papers on {topic.replace('_', ' ').title()}\n\n",
+            f"Total papers: {len(papers_data)}\n\n"
+        ]
         
         for paper_id, paper_info in papers_data.items():
-            content += f"## {paper_info['title']}\n"
-            content += f"- **Paper ID**: {paper_id}\n"
-            content += f"- **Authors**: {', '.join(paper_info['authors'])}\n"
-            content += f"- **Published**: {paper_info['published']}\n"
-            content += f"- **PDF URL**: [{paper_info['pdf_url']}]({paper_info['pdf_url']})\n\n"
-            content += f"### Summary\n{paper_info['summary'][:500]}...\n\n"
-            content += "---\n\n"
+            parts.append(_PAPER_MARKDOWN.format(
+                title=paper_info['title'],
+                paper_id=paper_id,
+                authors=', '.join(paper_info['authors']),
+                published=paper_info['published'],
+                pdf_url=paper_info['pdf_url'],
+                # Papers saved before summary_short existed are cut here instead
+                summary=paper_info.get('summary_short') or paper_info['summary'][:500]
+            ))
         
-        return content
+        return "".join(parts)
     except json.JSONDecodeError:
         return f"# Error reading papers data for {topic}\n\nThe papers data file is corrupted."
 
@@ -230,6 +806,30 @@ def generate_search_prompt(topic: str, num_papers: int = 5) -> str:
     
     Please present both detailed information about each paper and a high-level synthesis of the research landscape in {topic}."""
 
+# openFDA endpoint, stored document type and base query for each known topic
+_FDA_TOPIC_CONFIG = {
+    'recalls': (
+        'https://api.fda.gov/food/enforcement.json',
+        'recall',
+        {'search': 'status:"Ongoing"', 'sort': 'recall_initiation_date:desc'}
+    ),
+    'drugs': (
+        'https://api.fda.gov/drug/event.json',
+        'drug',
+        {'sort': 'receivedate:desc'}
+    ),
+    'food': (
+        'https://api.fda.gov/food/enforcement.json',
+        'food',
+        {'search': 'product_type:"food"', 'sort': 'recall_initiation_date:desc'}
+    ),
+    'clinical': (
+        'https://api.fda.gov/drug/event.json',  # Using drug events for clinical data
+        'clinical',
+        {'search': 'serious:1', 'sort': 'receivedate:desc'}  # Focus on serious clinical events
+    )
+}
+
 @mcp.tool()
 def search_fda(topic: str, max_results: int = 5) -> List[str]:
     """
@@ -243,85 +843,60 @@ def search_fda(topic: str, max_results: int = 5) -> List[str]:
         List of document IDs found in the search
     """
     
-    print(f"\n=== Starting FDA Search for topic '{topic}' ===")
-    print(f"FDA_DIR is set to: {FDA_DIR}")
-    print(f"Current working directory: {os.getcwd()}")
+    logger.info("Starting FDA search for topic '%s'", topic)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("FDA_DIR is set to: %s", FDA_DIR)
+        logger.debug("Current working directory: %s", os.getcwd())
     
     try:
-        # Setup headers for requests
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            'Accept': 'application/json',
-            'Accept-Language': 'en-US,en;q=0.5'
-        }
-        
         # Define search parameters based on topic
-        if topic.lower() == 'recalls':
-            search_url = 'https://api.fda.gov/food/enforcement.json'
-            doc_type = 'recall'
-            params = {
-                'search': 'status:"Ongoing"',
-                'limit': max_results,
-                'sort': 'recall_initiation_date:desc'
-            }
-        elif topic.lower() == 'drugs':
-            search_url = 'https://api.fda.gov/drug/event.json'
-            doc_type = 'drug'
-            params = {
-                'limit': max_results,
-                'sort': 'receivedate:desc'
-            }
-        elif topic.lower() == 'food':
-            search_url = 'https://api.fda.gov/food/enforcement.json'
-            doc_type = 'food'
-            params = {
-                'search': 'product_type:"food"',
-                'limit': max_results,
-                'sort': 'recall_initiation_date:desc'
-            }
-        elif topic.lower() == 'clinical':
-            search_url = 'https://api.fda.gov/drug/event.json'  # Using drug events for clinical data
-            doc_type = 'clinical'
-            params = {
-                'search': 'serious:1',  # Focus on serious clinical events
-                'limit': max_results,
-                'sort': 'receivedate:desc'
-            }
+        config = _FDA_TOPIC_CONFIG.get(topic.lower())
+        if config:
+            search_url, doc_type, base_params = config
         else:
             # For other topics, use the enforcement API with topic as search term
             search_url = 'https://api.fda.gov/food/enforcement.json'
             doc_type = 'general'
-            params = {
+            base_params = {
                 'search': f'reason_for_recall:"{topic}"',
-                'limit': max_results,
                 'sort': 'recall_initiation_date:desc'
             }
+        params = {**base_params, 'limit': max_results}
             
-        print(f"\nSearching FDA {doc_type} API: {search_url}")
-        print(f"Search parameters: {params}")
+        logger.info("Searching FDA %s API: %s", doc_type, search_url)
+        logger.debug("Search parameters: %s", params)
         
-        # Create a session and get the data
-        session = requests.Session()
-        session.headers.update(headers)
-        
-        response = session.get(search_url, params=params, timeout=10)
+        response = _FDA_SESSION.get(search_url, params=params, timeout=10)
         response.raise_for_status()
         
         # Parse JSON response
         data = response.json()
         results = data.get('results', [])
         
-        print(f"Found {len(results)} results")
+        logger.info("Found %d results", len(results))
+        
+        # Format the timestamps shared by every result once
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        id_date = now.strftime('%Y%m%d')
         
         # Process each result
         documents = []
         for idx, result in enumerate(results, 1):
             try:
-                print(f"\nProcessing result {idx}/{len(results)}")
+                logger.debug("Processing result %d/%d", idx, len(results))
                 
                 # Generate a unique document ID
-                doc_id = f"{doc_type}_{idx}_{datetime.now().strftime('%Y%m%d')}"
-                print(f"Generated document ID: {doc_id}")
+                doc_id = f"{doc_type}_{idx}_{id_date}"
+                logger.debug("Generated document ID: %s", doc_id)
+                
+                # Adverse event reports keep drug and reaction details under 'patient'
+                if doc_type in ['drug', 'clinical']:
+                    patient = result.get('patient') or {}
+                    drugs = patient.get('drug') or []
+                    reactions = patient.get('reaction') or []
+                    first_drug = drugs[0] if drugs else {}
+                    first_reaction = reactions[0] if reactions else {}
                 
                 # Extract information based on document type
                 if doc_type in ['recall', 'food', 'general']:
@@ -329,9 +904,9 @@ def search_fda(topic: str, max_results: int = 5) -> List[str]:
                         'id': doc_id,
                         'title': result.get('product_description', ''),
                         'summary': result.get('reason_for_recall', ''),
-                        'date': result.get('recall_initiation_date', datetime.now().strftime('%Y-%m-%d')),
+                        'date': _iso_date(result.get('recall_initiation_date', today)),
                         'type': doc_type,
-                        'retrieved_date': datetime.now().strftime('%Y-%m-%d'),
+                        'retrieved_date': today,
                         'product_info': {
                             'product_name': result.get('product_description', ''),
                             'company_name': result.get('recalling_firm', ''),
@@ -347,31 +922,31 @@ def search_fda(topic: str, max_results: int = 5) -> List[str]:
                 elif doc_type == 'drug':
                     doc_info = {
                         'id': doc_id,
-                        'title': result.get('patient', {}).get('drug', [{}])[0].get('medicinalproduct', ''),
-                        'summary': result.get('patient', {}).get('reaction', [{}])[0].get('reactionmeddrapt', ''),
-                        'date': result.get('receiptdate', datetime.now().strftime('%Y-%m-%d')),
+                        'title': first_drug.get('medicinalproduct', ''),
+                        'summary': first_reaction.get('reactionmeddrapt', ''),
+                        'date': _iso_date(result.get('receiptdate', today)),
                         'type': doc_type,
-                        'retrieved_date': datetime.now().strftime('%Y-%m-%d'),
+                        'retrieved_date': today,
                         'drug_info': {
-                            'drug_name': result.get('patient', {}).get('drug', [{}])[0].get('medicinalproduct', ''),
-                            'manufacturer': result.get('patient', {}).get('drug', [{}])[0].get('manufacturername', ''),
-                            'dosage_form': result.get('patient', {}).get('drug', [{}])[0].get('drugdosageform', ''),
-                            'route': result.get('patient', {}).get('drug', [{}])[0].get('drugadministrationroute', ''),
-                            'indication': result.get('patient', {}).get('drug', [{}])[0].get('drugindication', '')
+                            'drug_name': first_drug.get('medicinalproduct', ''),
+                            'manufacturer': first_drug.get('manufacturername', ''),
+                            'dosage_form': first_drug.get('drugdosageform', ''),
+                            'route': first_drug.get('drugadministrationroute', ''),
+                            'indication': first_drug.get('drugindication', '')
                         }
                     }
                 elif doc_type == 'clinical':
                     doc_info = {
                         'id': doc_id,
-                        'title': result.get('patient', {}).get('drug', [{}])[0].get('medicinalproduct', ''),
-                        'summary': result.get('patient', {}).get('reaction', [{}])[0].get('reactionmeddrapt', ''),
-                        'date': result.get('receiptdate', datetime.now().strftime('%Y-%m-%d')),
+                        'title': first_drug.get('medicinalproduct', ''),
+                        'summary': first_reaction.get('reactionmeddrapt', ''),
+                        'date': _iso_date(result.get('receiptdate', today)),
                         'type': doc_type,
-                        'retrieved_date': datetime.now().strftime('%Y-%m-%d'),
+                        'retrieved_date': today,
                         'clinical_info': {
                             'study_phase': 'N/A',  # Drug events don't have phases
-                            'conditions': [r.get('reactionmeddrapt', '') for r in result.get('patient', {}).get('reaction', []) if r.get('reactionmeddrapt')],
-                            'interventions': [d.get('medicinalproduct', '') for d in result.get('patient', {}).get('drug', []) if d.get('medicinalproduct')],
+                            'conditions': [r.get('reactionmeddrapt', '') for r in reactions if r.get('reactionmeddrapt')],
+                            'interventions': [d.get('medicinalproduct', '') for d in drugs if d.get('medicinalproduct')],
                             'status': result.get('serious', 'Unknown'),
                             'sponsor': result.get('companynumb', 'Unknown'),
                             'locations': [result.get('occurcountry', 'Unknown')],
@@ -379,12 +954,12 @@ def search_fda(topic: str, max_results: int = 5) -> List[str]:
                         }
                     }
                 
-                print(f"Created document info for: {doc_info['title']}")
+                logger.debug("Created document info for: %s", doc_info['title'])
                 documents.append(doc_info)
-                print(f"Added document: {doc_id}")
+                logger.debug("Added document: %s", doc_id)
                 
             except Exception as e:
-                print(f"Error processing result {idx}: {e}")
+                logger.warning("Error processing result %d: %s", idx, e)
                 continue
 
         # Create directory for this document type
@@ -392,40 +967,82 @@ def search_fda(topic: str, max_results: int = 5) -> List[str]:
         os.makedirs(path, exist_ok=True)
         
         file_path = os.path.join(path, "fda_info.json")
-        print(f"\nSaving data to: {file_path}")
+        logger.debug("Saving data to: %s", file_path)
         
-        # Try to load existing FDA info
-        try:
-            with open(file_path, "r") as json_file:
-                fda_info = json.load(json_file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            fda_info = {}
-
-        # Add new documents to existing data
+        # Collect the new documents by ID
+        new_docs = {}
         doc_ids = []
         for doc in documents:
             doc_id = doc['id']
-            fda_info[doc_id] = doc
+            new_docs[doc_id] = doc
             doc_ids.append(doc_id)
 
-        # Save to JSON file using atomic write
-        temp_file = file_path + '.tmp'
+        # Append the new documents to the store's log
         try:
-            with open(temp_file, "w") as json_file:
-                json.dump(fda_info, json_file, indent=2)
-            os.replace(temp_file, file_path)
-            print(f"Results are saved in: {file_path}")
+            _migrate_fda_dates(file_path)
+            is_new_store = not _store_exists(file_path)
+            _add_store_records(file_path, new_docs, compress=FDA_COMPRESS,
+                               intern_records=_intern_fda_records)
+            # A new store can appear in an existing topic directory, which
+            # does not change FDA_DIR's mtime
+            if is_new_store:
+                _FDA_FOLDERS_CACHE["mtime"] = None
+            logger.info("Results are saved in: %s", file_path)
             return doc_ids
         except Exception as e:
-            print(f"Error saving FDA data: {e}")
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            logger.error("Error saving FDA data: %s", e)
             return []
 
     except Exception as e:
-        print(f"Error in FDA search: {e}")
+        logger.error("Error in FDA search: %s", e)
         return []
 
+# Patterns used by the scraped-content extractors, compiled once at import
+_DRUG_NAME_FALLBACK_RE = re.compile(r"([A-Z][A-Za-z0-9\s\-]+(?:tablets|capsules|injection|solution))")
+_COMPANY_RE = re.compile(r"([A-Z][A-Za-z\s,\.]+(?:Inc\.|LLC|Ltd\.|Corp\.|Corporation|Company))")
+_DOSAGE_FALLBACK_RE = re.compile(r"(tablets|capsules|injection|solution|suspension)", re.IGNORECASE)
+_ROUTE_FALLBACK_RE = re.compile(r"(oral|intravenous|topical|subcutaneous|intramuscular)", re.IGNORECASE)
+_INDICATION_FALLBACK_RE = re.compile(r"indicated for\s+([^\.]+)", re.IGNORECASE)
+_PRODUCT_TITLE_RE = re.compile(r"recalls\s+([^\.]+)")
+# Longest numeral first, so "III" is not cut short at "I"
+_RECALL_CLASS_RE = re.compile(r"Class (III|II|I) Recall")
+_DISTRIBUTION_FALLBACK_RE = re.compile(r"distributed (?:to|in)\s+([^\.]+)", re.IGNORECASE)
+
+# All "Label: value" fields of each extractor in one pass. The lookahead
+# keeps matches zero-width, so a long value never hides a later label.
+_DRUG_FIELDS_RE = re.compile(
+    r"(?=(?P<label>Drug Name|Manufacturer|Dosage Form|Route|Indication):?\s*(?P<value>[^\.]+))"
+)
+_DRUG_FIELD_NAMES = {
+    'Drug Name': 'drug_name',
+    'Manufacturer': 'manufacturer',
+    'Dosage Form': 'dosage_form',
+    'Route': 'route',
+    'Indication': 'indication'
+}
+_PRODUCT_FIELDS_RE = re.compile(
+    r"(?=(?P<label>Product|Recall Number|Status|Distribution|Quantity):?\s*(?P<value>[^\.]+))"
+)
+_PRODUCT_FIELD_NAMES = {
+    'Product': 'product_name',
+    'Recall Number': 'recall_number',
+    'Status': 'recall_status',
+    'Distribution': 'distribution_pattern',
+    'Quantity': 'quantity'
+}
+_LOCATION_RE = re.compile(r"(?:in|from)\s+([A-Za-z\s]+),\s*([A-Z]{2})")
+
+def _scan_labelled_fields(content: str, pattern, field_names: dict) -> dict:
+    """Return the first "Label: value" match of each field, keyed by field name."""
+    found = {}
+    for match in pattern.finditer(content):
+        field = field_names[match.group('label')]
+        if field not in found:
+            found[field] = match.group('value').strip()
+            if len(found) == len(field_names):
+                break
+    return found
+
 def extract_drug_info_from_content(content: str) -> dict:
     """Helper function to extract drug information from scraped content."""
     info = {
@@ -436,35 +1053,23 @@ def extract_drug_info_from_content(content: str) -> dict:
         'indication': ''
     }
     
-    # Extract drug name - look for patterns like "Drug Name:" or prominent mentions
-    drug_name_match = re.search(r"Drug Name:?\s*([^\.]+)", content) or \
-                     re.search(r"([A-Z][A-Za-z0-9\s\-]+(?:tablets|capsules|injection|solution))", content)
-    if drug_name_match:
-        info['drug_name'] = drug_name_match.group(1).strip()
-    
-    # Extract manufacturer
-    manufacturer_match = re.search(r"Manufacturer:?\s*([^\.]+)", content) or \
-                        re.search(r"([A-Z][A-Za-z\s,\.]+(?:Inc\.|LLC|Ltd\.|Corp\.|Corporation|Company))", content)
-    if manufacturer_match:
-        info['manufacturer'] = manufacturer_match.group(1).strip()
-    
-    # Extract dosage form
-    dosage_match = re.search(r"Dosage Form:?\s*([^\.]+)", content) or \
-                   re.search(r"(tablets|capsules|injection|solution|suspension)", content, re.IGNORECASE)
-    if dosage_match:
-        info['dosage_form'] = dosage_match.group(1).strip()
-    
-    # Extract route of administration
-    route_match = re.search(r"Route:?\s*([^\.]+)", content) or \
-                 re.search(r"(oral|intravenous|topical|subcutaneous|intramuscular)", content, re.IGNORECASE)
-    if route_match:
-        info['route'] = route_match.group(1).strip()
-    
-    # Extract indication
-    indication_match = re.search(r"Indication:?\s*([^\.]+)", content) or \
-                      re.search(r"indicated for\s+([^\.]+)", content, re.IGNORECASE)
-    if indication_match:
-        info['indication'] = indication_match.group(1).strip()
+    # Extract the labelled fields ("Drug Name:", "Route:", ...) in one scan
+    found = _scan_labelled_fields(content, _DRUG_FIELDS_RE, _DRUG_FIELD_NAMES)
+    info.update(found)
+    
+    # Fall back to prominent mentions for fields without a label
+    fallbacks = (
+        ('drug_name', _DRUG_NAME_FALLBACK_RE),
+        ('manufacturer', _COMPANY_RE),
+        ('dosage_form', _DOSAGE_FALLBACK_RE),
+        ('route', _ROUTE_FALLBACK_RE),
+        ('indication', _INDICATION_FALLBACK_RE)
+    )
+    for field, pattern in fallbacks:
+        if field not in found:
+            match = pattern.search(content)
+            if match:
+                info[field] = match.group(1).strip()
     
     return info
 
@@ -482,51 +1087,89 @@ def extract_product_info_from_content(content: str, title: str, summary: str) ->
         'city': ''
     }
     
-    # Extract product name from title or content
-    product_match = re.search(r"Product:?\s*([^\.]+)", content) or \
-                   re.search(r"recalls\s+([^\.]+)", title)
-    if product_match:
-        info['product_name'] = product_match.group(1).strip()
+    # Extract the labelled fields, keeping the first occurrence of each label
+    found = _scan_labelled_fields(content, _PRODUCT_FIELDS_RE, _PRODUCT_FIELD_NAMES)
+    info.update(found)
+    
+    # Fall back to the title for the product name
+    if 'product_name' not in found:
+        product_match = _PRODUCT_TITLE_RE.search(title)
+        if product_match:
+            info['product_name'] = product_match.group(1).strip()
     
     # Extract company name
-    company_match = re.search(r"([A-Z][A-Za-z\s,\.]+(?:Inc\.|LLC|Ltd\.|Corp\.|Corporation|Company))", content)
+    company_match = _COMPANY_RE.search(content)
     if company_match:
         info['company_name'] = company_match.group(1).strip()
     
-    # Extract recall number
-    recall_num_match = re.search(r"Recall Number:?\s*([^\.]+)", content)
-    if recall_num_match:
-        info['recall_number'] = recall_num_match.group(1).strip()
-    
     # Extract recall classification
-    class_match = re.search(r"Class ([I|II|III]+) Recall", content)
+    class_match = _RECALL_CLASS_RE.search(content)
     if class_match:
         info['recall_classification'] = class_match.group(1)
     
-    # Extract recall status
-    status_match = re.search(r"Status:?\s*([^\.]+)", content)
-    if status_match:
-        info['recall_status'] = status_match.group(1).strip()
-    
-    # Extract distribution pattern
-    dist_match = re.search(r"Distribution:?\s*([^\.]+)", content) or \
-                re.search(r"distributed (?:to|in)\s+([^\.]+)", content, re.IGNORECASE)
-    if dist_match:
-        info['distribution_pattern'] = dist_match.group(1).strip()
-    
-    # Extract quantity if available
-    quantity_match = re.search(r"Quantity:?\s*([^\.]+)", content)
-    if quantity_match:
-        info['quantity'] = quantity_match.group(1).strip()
+    # Fall back to "distributed to/in ..." for the distribution pattern
+    if 'distribution_pattern' not in found:
+        dist_match = _DISTRIBUTION_FALLBACK_RE.search(content)
+        if dist_match:
+            info['distribution_pattern'] = dist_match.group(1).strip()
     
     # Extract location information if available
-    location_match = re.search(r"(?:in|from)\s+([A-Za-z\s]+),\s*([A-Z]{2})", content)
+    location_match = _LOCATION_RE.search(content)
     if location_match:
         info['city'] = location_match.group(1).strip()
         info['state'] = location_match.group(2)
     
     return info
 
+def _iso_date(date):
+    """
+    Normalize an FDA date (YYYY-MM-DD, MM/DD/YYYY or openFDA's YYYYMMDD) to
+    YYYY-MM-DD, which sorts chronologically as plain text.
+    
+    Values in any other form are returned unchanged.
+    """
+    if not isinstance(date, str):
+        return date
+    if len(date) == 8 and date.isdigit():
+        return f"{date[:4]}-{date[4:6]}-{date[6:]}"
+    parts = date.split('/')
+    if len(parts) == 3:
+        month, day, year = parts
+        return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+    parts = date.split('-')
+    if len(parts) == 3:
+        year, month, day = parts
+        return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+    return date
+
+def _migrate_fda_dates(json_file: str) -> None:
+    """
+    Rewrite an FDA store once if it still holds dates that are not YYYY-MM-DD.
+    
+    Called by the FDA writers before they append. Stores written since
+    dates were normalized on write need no rewrite, so each store is only
+    checked once per process. A failed rewrite is logged and left for the
+    next save; readers normalize dates in memory anyway.
+    """
+    if json_file in _ISO_DATE_STORES:
+        return
+    try:
+        fda_data = _load_store(json_file, _intern_fda_records)
+        if any(isinstance(doc, dict) and doc.get('date') != _iso_date(doc.get('date'))
+               for doc in fda_data.values()):
+            migrated = {
+                key: dict(doc, date=_iso_date(doc['date']))
+                if isinstance(doc, dict) and 'date' in doc else doc
+                for key, doc in fda_data.items()
+            }
+            _replace_store(json_file, migrated, compress=FDA_COMPRESS)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning("Could not migrate dates in %s: %s", json_file, e)
+        return
+    _ISO_DATE_STORES.add(json_file)
+
 @mcp.resource("fda://{topic}")
 def get_fda_documents(topic: str) -> str:
     """
@@ -547,75 +1190,109 @@ def get_fda_documents(topic: str) -> str:
     topic_dir = os.path.join(FDA_DIR, doc_type)
     json_file = os.path.join(topic_dir, "fda_info.json")
     
-    if not os.path.exists(json_file):
+    if not _store_exists(json_file):
         return f"# No FDA documents found for {topic}\n\nTry searching for FDA documents first using search_fda('{topic}')"
     
+    return _render_fda_documents(topic, json_file, _store_signature(json_file))
+
+# Markdown headers for one document in get_fda_documents, by document type
+_FDA_RECALL_MARKDOWN = (
+    "## {product} by {company}\n"
+    "- **Recall Date**: {date}\n"
+    "- **Recall Class**: {recall_class}\n"
+    "- **Distribution**: {distribution}\n"
+)
+_FDA_DRUG_MARKDOWN = (
+    "## {name}\n"
+    "- **Date**: {date}\n"
+    "- **Manufacturer**: {manufacturer}\n"
+    "- **Dosage Form**: {dosage_form}\n"
+    "- **Route**: {route}\n"
+)
+_FDA_CLINICAL_MARKDOWN = (
+    "## {title}\n"
+    "- **Date**: {date}\n"
+    "- **Phase**: {phase}\n"
+    "- **Status**: {status}\n"
+    "- **Sponsor**: {sponsor}\n"
+)
+_FDA_DOCUMENT_MARKDOWN = "## {title}\n- **Date**: {date}\n"
+
+@lru_cache(maxsize=128)
+def _render_fda_documents(topic: str, json_file: str, signature: tuple) -> str:
+    """Render the markdown for get_fda_documents, cached per file signature."""
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            fda_data = json.load(f)
+        fda_data = _load_store(json_file, _intern_fda_records)
         
         # Create markdown content with document details
-        content = f"# FDA {topic.title()} Information\n\n"
-        content += f"Total entries: {len(fda_data)}\n\n"
+        parts = [
+            f"# FDA {topic.title()} Information\n\n",
+            f"Total entries: {len(fda_data)}\n\n"
+        ]
         
-        # Sort entries by date
+        # YYYY-MM-DD sorts as plain text; legacy dates not yet migrated
+        # by a write are normalized here in memory
         sorted_entries = sorted(
             fda_data.items(),
-            key=lambda x: datetime.strptime(x[1]['date'], '%Y-%m-%d') if '-' in x[1]['date'] 
-            else datetime.strptime(x[1]['date'], '%m/%d/%Y'),
+            key=lambda item: _iso_date(item[1].get('date')) or '',
             reverse=True
         )
         
         for key, doc in sorted_entries:
             # Create section header based on document type
             if doc['type'] == 'recall':
-                product = doc.get('product_info', {}).get('product_name', 'Unknown Product')
-                company = doc.get('product_info', {}).get('company_name', 'Unknown Company')
-                content += f"## {product} by {company}\n"
-                content += f"- **Recall Date**: {doc['date']}\n"
-                content += f"- **Recall Class**: {doc.get('product_info', {}).get('recall_classification', 'Not specified')}\n"
-                content += f"- **Distribution**: {doc.get('product_info', {}).get('distribution_pattern', 'Not specified')}\n"
+                product_info = doc.get('product_info', {})
+                parts.append(_FDA_RECALL_MARKDOWN.format(
+                    product=product_info.get('product_name', 'Unknown Product'),
+                    company=product_info.get('company_name', 'Unknown Company'),
+                    date=doc['date'],
+                    recall_class=product_info.get('recall_classification', 'Not specified'),
+                    distribution=product_info.get('distribution_pattern', 'Not specified')
+                ))
             elif doc['type'] == 'drug':
                 drug_info = doc.get('drug_info', {})
-                content += f"## {drug_info.get('drug_name', doc['title'])}\n"
-                content += f"- **Date**: {doc['date']}\n"
-                content += f"- **Manufacturer**: {drug_info.get('manufacturer', 'Not specified')}\n"
-                content += f"- **Dosage Form**: {drug_info.get('dosage_form', 'Not specified')}\n"
-                content += f"- **Route**: {drug_info.get('route', 'Not specified')}\n"
+                parts.append(_FDA_DRUG_MARKDOWN.format(
+                    name=drug_info.get('drug_name', doc['title']),
+                    date=doc['date'],
+                    manufacturer=drug_info.get('manufacturer', 'Not specified'),
+                    dosage_form=drug_info.get('dosage_form', 'Not specified'),
+                    route=drug_info.get('route', 'Not specified')
+                ))
             elif doc['type'] == 'clinical':
                 clinical_info = doc.get('clinical_info', {})
-                content += f"## {doc['title']}\n"
-                content += f"- **Date**: {doc['date']}\n"
-                content += f"- **Phase**: {clinical_info.get('study_phase', 'Not specified')}\n"
-                content += f"- **Status**: {clinical_info.get('status', 'Not specified')}\n"
-                content += f"- **Sponsor**: {clinical_info.get('sponsor', 'Not specified')}\n"
+                parts.append(_FDA_CLINICAL_MARKDOWN.format(
+                    title=doc['title'],
+                    date=doc['date'],
+                    phase=clinical_info.get('study_phase', 'Not specified'),
+                    status=clinical_info.get('status', 'Not specified'),
+                    sponsor=clinical_info.get('sponsor', 'Not specified')
+                ))
             else:
-                content += f"## {doc['title']}\n"
-                content += f"- **Date**: {doc['date']}\n"
+                parts.append(_FDA_DOCUMENT_MARKDOWN.format(title=doc['title'], date=doc['date']))
             
             if doc.get('url'):
-                content += f"- **URL**: [{doc['url']}]({doc['url']})\n\n"
+                parts.append(f"- **URL**: [{doc['url']}]({doc['url']})\n\n")
             
             if doc['summary']:
-                content += f"### Summary\n{doc['summary']}\n\n"
+                parts.append(f"### Summary\n{doc['summary']}\n\n")
             
             # Add type-specific additional information
             if doc['type'] == 'clinical':
                 clinical_info = doc.get('clinical_info', {})
                 if clinical_info.get('conditions'):
-                    content += "### Conditions\n"
+                    parts.append("### Conditions\n")
                     for condition in clinical_info['conditions']:
-                        content += f"- {condition}\n"
-                    content += "\n"
+                        parts.append(f"- {condition}\n")
+                    parts.append("\n")
                 if clinical_info.get('interventions'):
-                    content += "### Interventions\n"
+                    parts.append("### Interventions\n")
                     for intervention in clinical_info['interventions']:
-                        content += f"- {intervention}\n"
-                    content += "\n"
+                        parts.append(f"- {intervention}\n")
+                    parts.append("\n")
             
-            content += "---\n\n"
+            parts.append("---\n\n")
         
-        return content
+        return "".join(parts)
     except json.JSONDecodeError:
         return f"# Error reading FDA data\n\nThe FDA data file is corrupted."
     except Exception as e:
@@ -658,26 +1335,32 @@ def generate_fda_search_prompt(topic: str, max_results: int = 5) -> str:
     
     Please present both the detailed document information and a high-level analysis of FDA's perspective and actions regarding {topic}."""
 
-def organize_fda_data(data: dict, doc_type: str) -> dict:
+def organize_fda_data(data: dict, doc_type: str, today: str = None, now_full: str = None) -> dict:
     """
     Organize FDA data based on document type.
     
     Args:
         data: Raw FDA data
         doc_type: Type of FDA document (recalls, drugs, food, clinical)
+        today: Retrieved date as YYYY-MM-DD (default: today)
+        now_full: Last-updated time as YYYY-MM-DD HH:MM:SS (default: now)
     
     Returns:
         Organized data structure
     """
+    if today is None or now_full is None:
+        now = datetime.now()
+        today = today or now.strftime('%Y-%m-%d')
+        now_full = now_full or now.strftime('%Y-%m-%d %H:%M:%S')
     organized = {
         'id': data.get('id'),
         'title': data.get('title'),
         'url': data.get('url'),
-        'date': data.get('date'),
+        'date': _iso_date(data.get('date')),
         'type': doc_type,
         'summary': data.get('summary'),
-        'retrieved_date': datetime.now().strftime('%Y-%m-%d'),
-        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        'retrieved_date': today,
+        'last_updated': now_full
     }
     
     # Add type-specific information
@@ -728,102 +1411,90 @@ def organize_fda_data(data: dict, doc_type: str) -> dict:
         
     return organized
 
+def _safe_organize(doc: dict, topic: str, idx: int, id_date: str, today: str, now_full: str):
+    """
+    Organize one document for save_fda_data.
+    
+    Returns None instead of raising, so one bad document does not abort
+    the whole batch.
+    """
+    try:
+        # Generate document ID if not present
+        if 'id' not in doc:
+            doc['id'] = f"{topic}_{idx}_{id_date}"
+        return organize_fda_data(doc, topic, today, now_full)
+    except Exception as e:
+        logger.warning("Error processing document %d: %s", idx, e)
+        return None
+
 @mcp.tool()
-def save_fda_data(topic: str, data: List[dict]) -> List[str]:
+def save_fda_data(topic: str, data: List[dict], durable: bool = False) -> List[str]:
     """
     Save FDA data to topic-specific folders with proper organization.
     
     Args:
         topic: The topic to save data for (recalls, drugs, food, clinical)
         data: List of FDA documents to save
+        durable: Whether to fsync the saved data so it survives power loss
         
     Returns:
         List of saved document IDs
     """
     try:
-        print(f"\nSaving FDA data for topic: {topic}")
-        print(f"Number of documents to save: {len(data)}")
+        logger.info("Saving FDA data for topic '%s'", topic)
+        logger.debug("Number of documents to save: %d", len(data))
         
-        # Create base FDA directory if it doesn't exist
-        if not os.path.exists(FDA_DIR):
-            print(f"Creating FDA base directory: {FDA_DIR}")
+        # Create base FDA directory once per process
+        global _fda_dir_ready
+        if not _fda_dir_ready:
+            logger.debug("Creating FDA base directory: %s", FDA_DIR)
             os.makedirs(FDA_DIR, exist_ok=True)
+            _fda_dir_ready = True
         
         # Create directory for this topic
-        path = os.path.join(FDA_DIR, topic.lower().replace(" ", "_"))
-        print(f"Creating topic directory: {path}")
+        paths = _FDA_TOPIC_PATHS.get(topic)
+        if paths is None:
+            path = os.path.join(FDA_DIR, topic.lower().replace(" ", "_"))
+            paths = _FDA_TOPIC_PATHS[topic] = (path, os.path.join(path, "fda_info.json"))
+        path, file_path = paths
+        logger.debug("Creating topic directory: %s", path)
         os.makedirs(path, exist_ok=True)
         
-        file_path = os.path.join(path, "fda_info.json")
-        print(f"Target file path: {file_path}")
+        logger.debug("Target file path: %s", file_path)
         
-        # Try to load existing FDA info
-        try:
-            with open(file_path, "r", encoding='utf-8') as json_file:
-                fda_info = json.load(json_file)
-                print(f"Loaded existing data with {len(fda_info)} documents")
-        except (FileNotFoundError, json.JSONDecodeError):
-            print("No existing data found, starting fresh")
-            fda_info = {}
-            
-        # Process and save each document
-        doc_ids = []
-        for idx, doc in enumerate(data, 1):
-            try:
-                print(f"\nProcessing document {idx}/{len(data)}")
-                
-                # Generate document ID if not present
-                if 'id' not in doc:
-                    doc['id'] = f"{topic}_{idx}_{datetime.now().strftime('%Y%m%d')}"
-                
-                # Organize data based on document type
-                organized_data = organize_fda_data(doc, topic)
-                
-                # Store document
-                doc_id = organized_data['id']
-                fda_info[doc_id] = organized_data
-                doc_ids.append(doc_id)
-                
-                print(f"Processed document: {doc_id}")
-                
-            except Exception as e:
-                print(f"Error processing document {idx}: {e}")
-                continue
+        # Organize every document, dropping the ones that fail
+        now = datetime.now()
+        id_date = now.strftime('%Y%m%d')
+        today = now.strftime('%Y-%m-%d')
+        now_full = now.strftime('%Y-%m-%d %H:%M:%S')
+        processed = [
+            organized
+            for organized in (_safe_organize(doc, topic, idx, id_date, today, now_full)
+                              for idx, doc in enumerate(data, 1))
+            if organized is not None
+        ]
+        doc_ids = [organized['id'] for organized in processed]
+        new_docs = dict(zip(doc_ids, processed))
         
-        # Save to JSON file
+        # Append the new documents to the store's log
         if doc_ids:
-            print(f"\nAttempting to save {len(doc_ids)} documents")
-            
-            # Create temporary file
-            temp_file = file_path + '.tmp'
+            logger.debug("Attempting to save %d documents", len(doc_ids))
             try:
-                # Write to temp file first
-                print("Writing to temporary file...")
-                with open(temp_file, "w", encoding='utf-8') as json_file:
-                    json.dump(fda_info, json_file, indent=2, ensure_ascii=False)
-                
-                # Verify temp file
-                print("Verifying temporary file...")
-                with open(temp_file, "r", encoding='utf-8') as json_file:
-                    test_load = json.load(json_file)
-                    if not test_load:
-                        raise ValueError("Empty JSON file")
-                
-                # Atomic rename
-                print("Performing atomic rename...")
-                os.replace(temp_file, file_path)
-                print(f"Successfully saved {len(doc_ids)} documents to: {file_path}")
-                
+                _migrate_fda_dates(file_path)
+                is_new_store = not _store_exists(file_path)
+                _add_store_records(file_path, new_docs, compress=FDA_COMPRESS,
+                                   durable=durable, intern_records=_intern_fda_records)
+                if is_new_store:
+                    _FDA_FOLDERS_CACHE["mtime"] = None
+                logger.info("Successfully saved %d documents to: %s", len(doc_ids), file_path)
             except Exception as e:
-                print(f"Error saving FDA data: {e}")
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
+                logger.error("Error saving FDA data: %s", e)
                 return []
             
         return doc_ids
         
     except Exception as e:
-        print(f"Error in save_fda_data: {e}")
+        logger.error("Error in save_fda_data: %s", e)
         return []
 
 @mcp.resource("fda://folders")
@@ -833,27 +1504,43 @@ def get_fda_folders() -> str:
     """
     folders = []
     
-    # Get all topic directories
-    if os.path.exists(FDA_DIR):
-        for topic_dir in os.listdir(FDA_DIR):
-            topic_path = os.path.join(FDA_DIR, topic_dir)
-            if os.path.isdir(topic_path):
-                fda_file = os.path.join(topic_path, "fda_info.json")
-                if os.path.exists(fda_file):
-                    folders.append(topic_dir)
+    # Creating a topic directory bumps FDA_DIR's mtime, so an unchanged
+    # mtime means the cached listing is still current
+    try:
+        mtime = os.stat(FDA_DIR).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    if mtime is not None and mtime == _FDA_FOLDERS_CACHE["mtime"]:
+        return _FDA_FOLDERS_CACHE["content"]
+    
+    # Get all topic directories; a missing FDA_DIR just means no topics
+    if mtime is not None:
+        try:
+            with os.scandir(FDA_DIR) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        fda_file = os.path.join(entry.path, "fda_info.json")
+                        if _store_exists(fda_file):
+                            folders.append(entry.name)
+        except FileNotFoundError:
+            pass
     
     # Create markdown content
-    content = "# Available FDA Topics\n\n"
+    parts = ["# Available FDA Topics\n\n"]
     if folders:
-        for folder in folders:
-            content += f"- {folder}\n"
-        content += f"\nUse @{folder} to access FDA information in that topic.\n"
+        parts.extend(f"- {folder}\n" for folder in folders)
+        parts.append("\nUse @<topic> to access FDA information in that topic.\n")
     else:
-        content += "No FDA topics found. Try searching for FDA information first.\n"
+        parts.append("No FDA topics found. Try searching for FDA information first.\n")
+    content = "".join(parts)
     
+    _FDA_FOLDERS_CACHE.update(mtime=mtime, content=content)
     return content
 
 if __name__ == "__main__":
+    # Log to stderr so stdout stays free for the stdio transport
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+    
     # Run MCP server
     #mcp.run(transport = 'stdio')
     mcp.run(transport = 'sse')